@@ -1,11 +1,38 @@
 import os
+
+# Thread env vars must be set before torch/numpy are imported to take effect
+os.environ.setdefault("OMP_NUM_THREADS", str(os.cpu_count() or 1))
+os.environ.setdefault("MKL_NUM_THREADS", str(os.cpu_count() or 1))
+
 import json
+import concurrent.futures
+import functools
+import multiprocessing
+import hashlib
+import sqlite3
 import fitz  # PyMuPDF
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
 from datetime import datetime
 import re
 import sys
 
+try:
+    import faiss  # Optional: fast similarity search
+except ImportError:
+    faiss = None
+
+try:
+    from fastembed import TextEmbedding  # Optional: ONNX Runtime encoder
+except ImportError:
+    TextEmbedding = None
+
+try:
+    import orjson  # Optional: fast JSON serialization
+except ImportError:
+    orjson = None
+
 # ===============================
 # 🔧 CONFIGURATION SETTINGS
 # ===============================
@@ -29,6 +56,18 @@ class Config:
     # Section extraction settings
     MAX_HEADING_LENGTH = 200  # Maximum length for text to be considered a heading
     MAX_HEADING_WORDS = 10  # Maximum words in a heading for title case detection
+
+    # Performance settings
+    NUM_WORKERS = None  # Worker processes for PDF parsing (None = auto: min(cpu_count, 4))
+    MAX_PAGES_PER_PDF = None  # Stop parsing each PDF after this many pages (None = all)
+    ENCODE_BATCH_SIZE = 64  # Batch size for sentence embedding
+    MAX_ENCODE_CHARS = 256  # Truncate section text before encoding (MiniLM caps at 128 tokens)
+    EMB_CACHE_DIR = "./.emb_cache"  # On-disk embedding cache folder (None to disable)
+    INDEX_TYPE = 'auto'  # FAISS index: 'auto', 'flat', 'ivf', or 'ivfpq'
+    USE_FP16 = True  # Run the encoder in half precision when on GPU
+    CPU_THREADS = None  # Torch intra-op threads for CPU encoding (None = cpu_count)
+    USE_ONNX = True  # Encode via fastembed/ONNX Runtime on CPU when installed
+    PARALLEL_ENCODE_THRESHOLD = 500  # Shard CPU encoding across processes above this many texts
     
     @classmethod
     def update_config(cls, **kwargs):
@@ -39,6 +78,32 @@ class Config:
             else:
                 print(f"Warning: Unknown configuration parameter: {key}")
 
+def _dump_json(data, path):
+    """
+    Write pretty-printed JSON, through orjson when installed - it is
+    several times faster than the stdlib for large outputs and produces
+    the same indent-2, non-ASCII-escaped format.
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+def _scan_pdf_folder(folder_path):
+    """
+    List the PDF files in a folder with a single scandir pass - scandir
+    returns cached stat info, so no per-file exists() syscalls are needed
+    later. Returns a sorted list of (filename, path) tuples.
+    """
+    if not os.path.exists(folder_path):
+        return []
+    with os.scandir(folder_path) as entries:
+        pdf_entries = [(entry.name, entry.path) for entry in entries
+                       if entry.is_file() and entry.name.lower().endswith('.pdf')]
+    return sorted(pdf_entries)
+
 def create_input_json_interactive():
     """
     Interactive function to help users create their input.json file
@@ -72,13 +137,8 @@ def create_input_json_interactive():
     
     # Find PDF files in the pdfs folder
     pdf_folder = Config.FOLDER_PATH
-    pdf_files = []
-    
-    if os.path.exists(pdf_folder):
-        for file in os.listdir(pdf_folder):
-            if file.lower().endswith('.pdf'):
-                pdf_files.append(file)
-    
+    pdf_files = [name for name, _ in _scan_pdf_folder(pdf_folder)]
+
     if not pdf_files:
         print(f"\n⚠️ No PDF files found in '{pdf_folder}' folder.")
         print("Please add your PDF files to the 'pdfs' folder and run this script again.")
@@ -114,8 +174,7 @@ def create_input_json_interactive():
     }
     
     # Save the input.json file
-    with open(Config.INPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(input_data, f, indent=2, ensure_ascii=False)
+    _dump_json(input_data, Config.INPUT_FILE)
     
     # Show summary
     print(f"\n✅ Created {Config.INPUT_FILE} successfully!")
@@ -127,21 +186,99 @@ def create_input_json_interactive():
     
     return True
 
-def extract_text_with_pages_from_pdf(pdf_path):
+def extract_sections_from_blocks(page_dict, page_number, min_section_length=None):
     """
-    Extract text from a PDF with page information using PyMuPDF.
-    Returns a list of (page_number, text) tuples.
+    Extract sections from PyMuPDF's dict-mode layout blocks, using font
+    size as the heading signal: lines noticeably larger than the page's
+    median text size start a new section. This skips the newline splitting
+    and regex scanning entirely. Returns [] when the page has no usable
+    blocks or no oversized headings, so the caller can fall back to the
+    regex line-scanner.
+    """
+    if min_section_length is None:
+        min_section_length = Config.MIN_SECTION_LENGTH
+
+    # Flatten blocks into (text, font_size) lines; image blocks have no 'lines'
+    lines = []
+    for block in page_dict.get('blocks', []):
+        for line in block.get('lines', []):
+            spans = line.get('spans', [])
+            text = ' '.join(span['text'] for span in spans).strip()
+            if text:
+                lines.append((text, max(span['size'] for span in spans)))
+
+    if not lines:
+        return []
+
+    sizes = sorted(size for _, size in lines)
+    heading_cutoff = sizes[len(sizes) // 2] * 1.2  # Median body size + 20%
+
+    sections = []
+    current_title = ""
+    current_parts = []
+
+    for text, size in lines:
+        if size >= heading_cutoff and len(text) < Config.MAX_HEADING_LENGTH:
+            content = ' '.join(current_parts)
+            if current_title and len(content) >= min_section_length:
+                sections.append({
+                    'title': current_title,
+                    'content': content,
+                    'page_number': page_number
+                })
+            current_title = text
+            current_parts = []
+        else:
+            current_parts.append(text)
+
+    # Add the last section
+    content = ' '.join(current_parts)
+    if current_title and len(content) >= min_section_length:
+        sections.append({
+            'title': current_title,
+            'content': content,
+            'page_number': page_number
+        })
+
+    return sections
+
+def extract_sections_from_pdf(pdf_path):
+    """
+    Parse one PDF and yield its sections (without the 'document' tag).
+    Pages are segmented from PyMuPDF's layout blocks where possible, with
+    the regex line-scanner as fallback for pages where font sizes carry
+    no heading structure. Streaming page by page keeps peak memory at one
+    page's worth of text, and Config.MAX_PAGES_PER_PDF can cap how deep
+    each document is parsed.
     """
-    pages = []
     try:
         with fitz.open(pdf_path) as doc:
             for page_num, page in enumerate(doc, 1):
-                text = page.get_text().strip()
-                if text:
-                    pages.append((page_num, text))
+                if Config.MAX_PAGES_PER_PDF and page_num > Config.MAX_PAGES_PER_PDF:
+                    break
+                # Build the TextPage once and share it between the dict and
+                # plain-text extractions, so the layout pass doesn't run
+                # twice when we fall back. Skipping ligature normalization
+                # also shaves a little time per page.
+                textpage = page.get_textpage(
+                    flags=fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_LIGATURES)
+                page_sections = extract_sections_from_blocks(
+                    page.get_text("dict", textpage=textpage), page_num)
+                if not page_sections:
+                    text = page.get_text(textpage=textpage).strip()
+                    if text:
+                        page_sections = extract_sections_from_text(text, page_num)
+                textpage = None  # Free the TextPage before the next page
+                yield from page_sections
     except Exception as e:
         print(f"❌ Error reading PDF {pdf_path}: {e}")
-    return pages
+
+# Precompiled heading patterns - re.match with string patterns pays a cache
+# lookup per line, which adds up over thousands of lines per corpus
+_HEAD_TITLECASE = re.compile(r'^[A-Z][^.!?]*[^.!?]$')
+_HEAD_NUMBERED = re.compile(r'^\d+[\.\)]\s*[A-Z]')
+_HEAD_BULLET = re.compile(r'^[•\-\*]\s*[A-Z]')
+_WS = re.compile(r'\s+')
 
 def extract_sections_from_text(text, page_number, min_section_length=None):
     """
@@ -150,9 +287,14 @@ def extract_sections_from_text(text, page_number, min_section_length=None):
     """
     if min_section_length is None:
         min_section_length = Config.MIN_SECTION_LENGTH
-        
+
+    # Near-empty pages (covers, separators) can't yield a valid section -
+    # skip all the splitting and regex work outright
+    if len(text) < min_section_length:
+        return []
+
     sections = []
-    
+
     # Multiple strategies for section extraction
     
     # Strategy 1: Split by double newlines (paragraph breaks)
@@ -160,7 +302,7 @@ def extract_sections_from_text(text, page_number, min_section_length=None):
     
     # Strategy 2: Look for common heading patterns
     lines = text.split('\n')
-    current_section = ""
+    current_parts = []  # Accumulate lines and join once - += on a str is O(n^2)
     current_title = ""
     
     for line in lines:
@@ -173,41 +315,44 @@ def extract_sections_from_text(text, page_number, min_section_length=None):
         
         # Check various heading patterns
         if len(line) < Config.MAX_HEADING_LENGTH:  # Reasonable heading length
+            word_count = len(line.split())  # Split once per line, not per pattern
             # Pattern 1: All caps
             if line.isupper() and len(line) > 3:
                 is_heading = True
             # Pattern 2: Title case starting with capital, no ending punctuation
-            elif re.match(r'^[A-Z][^.!?]*[^.!?]$', line) and len(line.split()) <= Config.MAX_HEADING_WORDS:
+            elif word_count <= Config.MAX_HEADING_WORDS and _HEAD_TITLECASE.match(line):
                 is_heading = True
             # Pattern 3: Lines ending with colon
-            elif line.endswith(':') and len(line.split()) <= 8:
+            elif line.endswith(':') and word_count <= 8:
                 is_heading = True
             # Pattern 4: Numbered sections
-            elif re.match(r'^\d+[\.\)]\s*[A-Z]', line):
+            elif _HEAD_NUMBERED.match(line):
                 is_heading = True
             # Pattern 5: Bullet point headers
-            elif re.match(r'^[•\-\*]\s*[A-Z]', line) and len(line.split()) <= 8:
+            elif word_count <= 8 and _HEAD_BULLET.match(line):
                 is_heading = True
         
         if is_heading:
             # Save previous section if it exists and has enough content
-            if current_title and current_section and len(current_section.strip()) >= min_section_length:
+            current_section = ' '.join(current_parts)
+            if current_title and len(current_section) >= min_section_length:
                 sections.append({
                     'title': current_title,
-                    'content': current_section.strip(),
+                    'content': current_section,
                     'page_number': page_number
                 })
-            
+
             current_title = line
-            current_section = ""
+            current_parts = []
         else:
-            current_section += line + " "
-    
+            current_parts.append(line)
+
     # Add the last section
-    if current_title and current_section and len(current_section.strip()) >= min_section_length:
+    current_section = ' '.join(current_parts)
+    if current_title and len(current_section) >= min_section_length:
         sections.append({
             'title': current_title,
-            'content': current_section.strip(),
+            'content': current_section,
             'page_number': page_number
         })
     
@@ -236,33 +381,208 @@ def extract_sections_from_text(text, page_number, min_section_length=None):
     
     return sections
 
+def _process_pdf(path_and_filename):
+    """
+    Worker entry point: parse one PDF and tag its sections with the source
+    filename, so only the final section dicts cross the process boundary
+    rather than raw page text.
+    """
+    path, filename = path_and_filename
+    sections = []
+    for section in extract_sections_from_pdf(path):
+        section['document'] = filename
+        sections.append(section)
+    return sections
+
 def load_documents_with_sections(folder_path, input_documents):
     """
     Load text from PDF files specified in input_documents and extract sections.
     """
     all_sections = []
-    
+    tasks = []
+
+    # One folder scan up front instead of an exists() syscall per file
+    available = dict(_scan_pdf_folder(folder_path))
+
     for doc_info in input_documents:
         filename = doc_info['filename']
-        path = os.path.join(folder_path, filename)
-        
-        if not os.path.exists(path):
+        path = available.get(filename)
+
+        if path is None:
             print(f"⚠️ File not found: {filename}")
             continue
-            
+
         if filename.endswith('.pdf'):
-            pages = extract_text_with_pages_from_pdf(path)
-            
-            for page_num, text in pages:
-                sections = extract_sections_from_text(text, page_num)
-                for section in sections:
-                    section['document'] = filename
-                    all_sections.append(section)
+            tasks.append((path, filename))
         else:
             print(f"⚠️ Unsupported file type: {filename}")
-    
+
+    # Parse PDFs in parallel - each file is independent, so this scales
+    # nearly linearly up to a handful of worker processes
+    num_workers = Config.NUM_WORKERS or min(os.cpu_count() or 1, 4)
+    if len(tasks) > 1 and num_workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            results = executor.map(_process_pdf, tasks, chunksize=1)
+            for sections in results:
+                all_sections.extend(sections)
+    else:
+        for task_args in tasks:
+            all_sections.extend(_process_pdf(task_args))
+
     return all_sections
 
+@functools.lru_cache(maxsize=4)
+def _get_model(model_name):
+    """
+    Load a SentenceTransformer once per process and reuse it across calls.
+    Uses the GPU when available - inference there is roughly an order of
+    magnitude faster - and switches to FP16 for a further speedup.
+    """
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda" and Config.USE_FP16:
+        model.half()
+    return model
+
+def _use_onnx():
+    """ONNX Runtime inference is a CPU optimization - skip it on GPU."""
+    return Config.USE_ONNX and TextEmbedding is not None and not torch.cuda.is_available()
+
+@functools.lru_cache(maxsize=4)
+def _get_onnx_encoder(model_name):
+    """Load a fastembed (ONNX Runtime) encoder once per process."""
+    if '/' not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+    return TextEmbedding(model_name=model_name)
+
+_pool_model_name = None  # Set in each encode-pool worker by _encode_pool_init
+
+def _encode_pool_init(model_name):
+    """Pool initializer: one torch thread per worker, model loaded once."""
+    global _pool_model_name
+    torch.set_num_threads(1)
+    _pool_model_name = model_name
+    _get_model(model_name)
+
+def _encode_pool_worker(texts):
+    """Encode one shard of texts; float16 keeps the IPC payload small."""
+    return _get_model(_pool_model_name).encode(
+        texts,
+        batch_size=Config.ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+        normalize_embeddings=True
+    ).astype(np.float16)
+
+def _encode_batch(texts, model_name):
+    """
+    Encode a batch of texts into L2-normalized float32 numpy embeddings.
+    Uses fastembed's ONNX Runtime backend on CPU when available (roughly
+    2-4x faster than the PyTorch path), otherwise sentence-transformers.
+    Large batches on CPU are sharded across worker processes, which scales
+    better than letting intra-op threads fight over one model.
+    """
+    big_batch = len(texts) > Config.PARALLEL_ENCODE_THRESHOLD
+    num_shards = max((os.cpu_count() or 2) // 2, 2)
+
+    if _use_onnx():
+        encoder = _get_onnx_encoder(model_name)
+        emb = np.array(list(encoder.embed(texts,
+                                          batch_size=Config.ENCODE_BATCH_SIZE,
+                                          parallel=num_shards if big_batch else None)),
+                       dtype=np.float32)
+        emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+        return emb
+
+    if big_batch and not torch.cuda.is_available():
+        shards = [list(shard) for shard in np.array_split(np.asarray(texts, dtype=object), num_shards)]
+        with multiprocessing.Pool(num_shards, initializer=_encode_pool_init,
+                                  initargs=(model_name,)) as pool:
+            parts = pool.map(_encode_pool_worker, shards)
+        emb = np.concatenate(parts).astype(np.float32)
+        emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+        return emb
+
+    return _get_model(model_name).encode(
+        texts,
+        batch_size=Config.ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+        normalize_embeddings=True
+    ).astype(np.float32)
+
+def _emb_cache_connect(model_name):
+    """Open (creating if needed) the on-disk embedding cache for a model."""
+    os.makedirs(Config.EMB_CACHE_DIR, exist_ok=True)
+    safe_name = model_name.replace('/', '_')
+    if _use_onnx():
+        safe_name += '-onnx'  # Keep ONNX and PyTorch vectors separate
+    conn = sqlite3.connect(os.path.join(Config.EMB_CACHE_DIR, f"{safe_name}.sqlite"))
+    conn.execute("CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB)")
+    return conn
+
+def _encode_texts(texts, model_name):
+    """
+    Encode texts into normalized embeddings, reusing vectors cached from
+    previous runs. The cache is keyed by sha256 of the text and stored as
+    float16 in a per-model sqlite file, so re-running on the same PDFs
+    only encodes what actually changed.
+    Returns a float32 torch tensor of shape (len(texts), dim).
+    """
+    if not Config.EMB_CACHE_DIR:
+        return torch.from_numpy(_encode_batch(texts, model_name))
+
+    hashes = [hashlib.sha256(t.encode('utf-8')).digest() for t in texts]
+    vecs = [None] * len(texts)
+    conn = _emb_cache_connect(model_name)
+    try:
+        for i, h in enumerate(hashes):
+            row = conn.execute("SELECT vec FROM embeddings WHERE hash = ?", (h,)).fetchone()
+            if row:
+                vecs[i] = np.frombuffer(row[0], dtype=np.float16).astype(np.float32)
+
+        # Encode only the cache misses, in a single batched call
+        miss_indices = [i for i, v in enumerate(vecs) if v is None]
+        if miss_indices:
+            miss_embeddings = _encode_batch([texts[i] for i in miss_indices], model_name)
+            for i, emb in zip(miss_indices, miss_embeddings):
+                vecs[i] = emb.astype(np.float32)
+                conn.execute("INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                             (hashes[i], emb.astype(np.float16).tobytes()))
+            conn.commit()
+    finally:
+        conn.close()
+
+    return torch.from_numpy(np.stack(vecs))
+
+def _build_faiss_index(emb):
+    """
+    Build a FAISS index sized to the corpus. Flat search is exact and
+    fastest for small runs; IVF and IVFPQ trade a little recall for large
+    speed and memory wins once section counts reach the tens of thousands.
+    """
+    n, dim = emb.shape
+    index_type = Config.INDEX_TYPE
+    if index_type == 'auto':
+        if n > 100000:
+            index_type = 'ivfpq'  # PQ32x8 cuts memory ~12x vs float32
+        elif n > 50000:
+            index_type = 'ivf'
+        else:
+            index_type = 'flat'
+
+    if index_type == 'flat':
+        return faiss.IndexFlatIP(dim)
+
+    factory = "IVF1024,PQ32x8" if index_type == 'ivfpq' else "IVF256,Flat"
+    index = faiss.index_factory(dim, factory, faiss.METRIC_INNER_PRODUCT)
+
+    # Quantized indexes need training on a sample before vectors are added
+    sample = emb[np.random.choice(n, size=min(n, 10000), replace=False)]
+    index.train(sample)
+    index.nprobe = 8
+    return index
+
 def find_relevant_sections(task, sections, model_name='all-MiniLM-L6-v2', top_n=5, min_similarity=0.1):
     """
     Find sections most relevant to the given task using semantic similarity.
@@ -274,39 +594,77 @@ def find_relevant_sections(task, sections, model_name='all-MiniLM-L6-v2', top_n=
         top_n (int): Number of top sections to return
         min_similarity (float): Minimum similarity threshold
     """
-    model = SentenceTransformer(model_name)
-    
     if not sections:
         return []
     
     # Create text for similarity comparison
     section_texts = []
     for section in sections:
-        # Combine title and content for better matching
+        # Combine title and content for better matching; truncate so batches
+        # don't waste compute on text beyond the model's sequence limit
         combined_text = f"{section['title']} {section['content']}"
-        section_texts.append(combined_text)
-    
-    # Encode task and sections
-    task_embedding = model.encode(task, convert_to_tensor=True)
-    section_embeddings = model.encode(section_texts, convert_to_tensor=True)
-    
-    # Calculate similarities
-    similarities = util.cos_sim(task_embedding, section_embeddings)[0]
-    
-    # Get top sections with similarity scores
+        section_texts.append(combined_text[:Config.MAX_ENCODE_CHARS])
+
+    # Deduplicate before encoding - boilerplate repeated across PDFs
+    # (headers, footers, disclaimers) only needs one forward pass
+    unique_indices = {}
+    for text in section_texts:
+        if text not in unique_indices:
+            unique_indices[text] = len(unique_indices)
+
+    # Encode task and sections - one batched call over the full list lets
+    # the encoder sort by length and minimize padding waste. The task goes
+    # through the same backend so both live in the same embedding space.
+    task_embedding = _encode_texts([task], model_name)[0]
+    unique_embeddings = _encode_texts(list(unique_indices), model_name)
+
+    # Expand back so each section (duplicates included) keeps its own row
+    section_embeddings = unique_embeddings[[unique_indices[text] for text in section_texts]]
+
+    if faiss is not None:
+        # Cosine top-k via FAISS inner product over L2-normalized vectors -
+        # uses SIMD/BLAS instead of a Python sort over all sections
+        emb = section_embeddings.cpu().numpy().astype('float32')
+        faiss.normalize_L2(emb)
+        query = task_embedding.cpu().numpy().reshape(1, -1).astype('float32')
+        faiss.normalize_L2(query)
+
+        index = _build_faiss_index(emb)
+        index.add(emb)
+        scores, indices = index.search(query, min(top_n, len(sections)))
+
+        scored_sections = []
+        for similarity, i in zip(scores[0], indices[0]):
+            if i >= 0 and float(similarity) >= min_similarity:
+                scored_sections.append({
+                    'section': sections[i],
+                    'similarity': float(similarity),
+                    'index': int(i)
+                })
+        return scored_sections
+
+    # Fallback without FAISS: one BLAS matrix-vector product plus an
+    # argpartition top-k instead of scoring and fully sorting in Python
+    emb = section_embeddings.cpu().numpy().astype(np.float32)
+    emb /= np.linalg.norm(emb, axis=1, keepdims=True)
+    query = task_embedding.cpu().numpy().astype(np.float32)
+    query /= np.linalg.norm(query)
+    similarities = emb @ query
+
+    k = min(top_n, len(similarities))
+    top_indices = np.argpartition(-similarities, k - 1)[:k]
+    top_indices = top_indices[np.argsort(-similarities[top_indices])]
+
     scored_sections = []
-    for i, (section, similarity) in enumerate(zip(sections, similarities)):
+    for i in top_indices:
         # Only include sections above minimum similarity threshold
-        if float(similarity) >= min_similarity:
+        if float(similarities[i]) >= min_similarity:
             scored_sections.append({
-                'section': section,
-                'similarity': float(similarity),
-                'index': i
+                'section': sections[i],
+                'similarity': float(similarities[i]),
+                'index': int(i)
             })
-    
-    # Sort by similarity and return top N
-    scored_sections.sort(key=lambda x: x['similarity'], reverse=True)
-    return scored_sections[:top_n]
+    return scored_sections
 
 def create_output_json(input_data, relevant_sections):
     """
@@ -339,10 +697,11 @@ def create_output_json(input_data, relevant_sections):
     subsection_analysis = []
     for item in relevant_sections:
         section = item['section']
-        # Limit content to reasonable length and clean it up
-        refined_text = section['content'][:Config.MAX_REFINED_TEXT_LENGTH].strip()
-        # Remove extra whitespace
-        refined_text = re.sub(r'\s+', ' ', refined_text)
+        # Limit content to reasonable length and collapse extra whitespace
+        content = section['content']
+        if len(content) > Config.MAX_REFINED_TEXT_LENGTH:
+            content = content[:Config.MAX_REFINED_TEXT_LENGTH]
+        refined_text = _WS.sub(' ', content).strip()
         
         subsection_analysis.append({
             "document": section['document'],
@@ -360,6 +719,14 @@ def create_output_json(input_data, relevant_sections):
 # 🔧 MAIN PROGRAM CONFIGURATION
 # ===============================
 if __name__ == "__main__":
+    # Containers often leave torch at suboptimal thread defaults - pin the
+    # intra-op pool to the available cores for the CPU encode path
+    torch.set_num_threads(Config.CPU_THREADS or os.cpu_count() or 1)
+    try:
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        pass  # Can only be set once, before any parallel work has started
+
     # ===========================================
     # 🎯 WELCOME MESSAGE
     # ===========================================
@@ -448,11 +815,8 @@ if __name__ == "__main__":
         print(f"📂 Created '{folder_path}' folder - add your PDF files here")
         sys.exit(1)
     
-    pdf_files = []
-    for file in os.listdir(folder_path):
-        if file.lower().endswith('.pdf'):
-            pdf_files.append(file)
-    
+    pdf_files = [name for name, _ in _scan_pdf_folder(folder_path)]
+
     if not pdf_files:
         print(f"\n⚠️ No PDF files found in '{folder_path}' folder.")
         print("Please add your PDF files to the 'pdfs' folder and try again.")
@@ -517,8 +881,7 @@ if __name__ == "__main__":
     output_data = create_output_json(input_data, relevant_sections)
     
     # Save output
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    _dump_json(output_data, output_file)
     
     print(f"✅ Output saved to {output_file}")
     print(f"\n🔝 Top {len(relevant_sections)} relevant sections:")